@@ -5,10 +5,72 @@ Loads prompts from markdown files in the prompts directory.
 """
 
 import os
-import re
-from typing import List, Dict, Any
+import logging
+import csv
+import functools
+import concurrent.futures
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+class Prompt(NamedTuple):
+    """A single test prompt with its baseline response time."""
+    question: str
+    current_response_time: str
+    expected_behavior: str = 'Should provide real-time search results with citations'
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the prompt as a plain dictionary (the previous loader format)."""
+        return self._asdict()
+
+def _parse_bullet(line: str) -> Optional[str]:
+    """
+    Extract the prompt from a markdown bullet line ("- "), or None.
+    
+    Checks the line start directly instead of running a backtracking regex.
+    """
+    stripped = line.lstrip()
+    if not stripped.startswith('- '):
+        return None
+    # Drop trailing "?"/"." and normalise to a single question mark
+    prompt = stripped[2:].rstrip().rstrip('?.').strip()
+    return prompt + '?' if prompt else None
+
+@functools.lru_cache(maxsize=64)
+def _load_md(path_str: str, mtime_ns: int) -> Tuple[str, ...]:
+    """
+    Read and parse a markdown prompt file.
+    
+    Cached on (path, mtime) so repeated loads skip disk I/O and parsing,
+    while an edited file is picked up automatically.
+    """
+    # Decode the whole file in one call rather than through the text-mode reader;
+    # splitlines() below still handles "\r\n" line endings
+    content = Path(path_str).read_bytes().decode('utf-8')
+    
+    prompts = (_parse_bullet(line) for line in content.splitlines())
+    return tuple(prompt for prompt in prompts if prompt)
+
+@functools.lru_cache(maxsize=64)
+def _load_csv(path_str: str, mtime_ns: int) -> Tuple[Prompt, ...]:
+    """
+    Read and parse a CSV prompt file.
+    
+    Cached on (path, mtime), like _load_md.
+    """
+    prompts = []
+    
+    with open(path_str, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            # Clean up the response time (add the 's' suffix only if missing)
+            current_time = row['Current response time (seconds)']
+            if not current_time.endswith('s'):
+                current_time += 's'
+            prompts.append(Prompt(question=row['Question'], current_response_time=current_time))
+    
+    return tuple(prompts)
+
 class PromptLoader:
     """Utility class to load prompts from markdown files."""
     
@@ -21,6 +83,16 @@ class PromptLoader:
         """
         self.prompts_dir = Path(prompts_dir)
         
+    def _cache_key(self, file_path: Path) -> Tuple[str, int]:
+        """
+        Build the (path, mtime) key used by the module-level file caches.
+        
+        The path is resolved so loaders created with different prompts_dir
+        spellings (or from a different working directory) share entries
+        correctly, and the nanosecond mtime catches quick successive edits.
+        """
+        return str(file_path.resolve()), file_path.stat().st_mtime_ns
+    
     def load_prompts_from_markdown(self, filename: str) -> List[str]:
         """
         Load prompts from a markdown file.
@@ -36,27 +108,9 @@ class PromptLoader:
         if not file_path.exists():
             raise FileNotFoundError(f"Prompt file not found: {file_path}")
         
-        prompts = []
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Extract prompts using regex pattern
-        # Look for lines that start with "- " (both with and without question marks)
-        prompt_pattern = r'^\s*-\s*(.+?)(?:\?|\.)?\s*$'
-        matches = re.findall(prompt_pattern, content, re.MULTILINE)
-        
-        for match in matches:
-            prompt = match.strip()
-            if prompt:
-                # Add question mark if not present
-                if not prompt.endswith('?'):
-                    prompt += '?'
-                prompts.append(prompt)
-        
-        return prompts
+        return list(_load_md(*self._cache_key(file_path)))
     
-    def load_prompts_from_csv(self, filename: str) -> List[Dict[str, Any]]:
+    def load_prompts_from_csv(self, filename: str) -> List[Prompt]:
         """
         Load prompts from a CSV file.
         
@@ -64,62 +118,46 @@ class PromptLoader:
             filename: Name of the CSV file (e.g., 'bing-prompts.csv')
             
         Returns:
-            List of dictionaries containing prompt data
+            List of Prompt records
         """
-        import pandas as pd
-        
         file_path = self.prompts_dir / filename
         
         if not file_path.exists():
             raise FileNotFoundError(f"Prompt file not found: {file_path}")
         
-        df = pd.read_csv(file_path)
-        prompts = []
-        
-        for _, row in df.iterrows():
-            # Clean up the response time (remove 's' suffix if present)
-            current_time = str(row['Current response time (seconds)'])
-            if current_time.endswith('s'):
-                current_time = current_time[:-1]
-            
-            prompts.append({
-                'question': row['Question'],
-                'current_response_time': f"{current_time}s",
-                'expected_behavior': 'Should provide real-time search results with citations'
-            })
-        
-        return prompts
+        return list(_load_csv(*self._cache_key(file_path)))
     
-    def load_all_prompts(self) -> List[Dict[str, Any]]:
+    def load_all_prompts(self, sources: Tuple[str, ...] = ('csv', 'markdown')) -> List[Prompt]:
         """
-        Load all prompts from both CSV and markdown files.
+        Load all prompts from CSV and/or markdown files.
         
+        Args:
+            sources: Which prompt sources to load ('csv', 'markdown')
+            
         Returns:
-            List of dictionaries containing all prompt data
+            List of Prompt records for all prompts
         """
         all_prompts = []
         
         # Load prompts from CSV file
-        try:
-            csv_prompts = self.load_prompts_from_csv('bing-prompts.csv')
-            all_prompts.extend(csv_prompts)
-            print(f"Loaded {len(csv_prompts)} prompts from CSV")
-        except Exception as e:
-            print(f"Warning: Could not load prompts from CSV: {e}")
+        if 'csv' in sources:
+            try:
+                csv_prompts = self.load_prompts_from_csv('bing-prompts.csv')
+                all_prompts.extend(csv_prompts)
+                logger.info(f"Loaded {len(csv_prompts)} prompts from CSV")
+            except Exception as e:
+                logger.warning(f"Could not load prompts from CSV: {e}")
         
         # Load prompts from markdown file
-        try:
-            md_prompts = self.load_prompts_from_markdown('long_prompt.md')
-            # Convert markdown prompts to the same format as CSV prompts
-            for prompt in md_prompts:
-                all_prompts.append({
-                    'question': prompt,
-                    'current_response_time': '15.0s',  # Estimated baseline
-                    'expected_behavior': 'Should provide real-time search results with citations'
-                })
-            print(f"Loaded {len(md_prompts)} prompts from markdown")
-        except Exception as e:
-            print(f"Warning: Could not load prompts from markdown: {e}")
+        if 'markdown' in sources:
+            try:
+                md_prompts = self.load_prompts_from_markdown('long_prompt.md')
+                # Convert markdown prompts to the same format as CSV prompts
+                for prompt in md_prompts:
+                    all_prompts.append(Prompt(question=prompt, current_response_time='15.0s'))  # Estimated baseline
+                logger.info(f"Loaded {len(md_prompts)} prompts from markdown")
+            except Exception as e:
+                logger.warning(f"Could not load prompts from markdown: {e}")
         
         return all_prompts
     
@@ -130,16 +168,27 @@ class PromptLoader:
         Returns:
             List of markdown filenames
         """
-        if not self.prompts_dir.exists():
+        try:
+            # scandir entries carry name/type info from the directory listing itself
+            with os.scandir(self.prompts_dir) as entries:
+                markdown_files = [
+                    entry.name for entry in entries
+                    if entry.is_file() and entry.name.endswith('.md')
+                    and entry.name != "README.md"  # Exclude README
+                ]
+        except FileNotFoundError:
             return []
         
-        markdown_files = []
-        for file_path in self.prompts_dir.glob("*.md"):
-            if file_path.name != "README.md":  # Exclude README
-                markdown_files.append(file_path.name)
-        
         return sorted(markdown_files)
     
+    def _try_load_prompts_from_markdown(self, filename: str) -> Tuple[str, Optional[List[str]]]:
+        """Load a markdown prompt file, returning (filename, None) on failure."""
+        try:
+            return filename, self.load_prompts_from_markdown(filename)
+        except Exception as e:
+            logger.warning(f"Could not load prompts from {filename}: {e}")
+            return filename, None
+    
     def load_all_prompt_sets(self) -> Dict[str, List[str]]:
         """
         Load all available prompt sets from markdown files.
@@ -148,22 +197,30 @@ class PromptLoader:
             Dictionary mapping filename to list of prompts
         """
         prompt_sets = {}
+        files = self.get_available_prompt_files()
+        if not files:
+            return prompt_sets
         
-        for filename in self.get_available_prompt_files():
-            try:
-                prompts = self.load_prompts_from_markdown(filename)
-                # Remove .md extension for key name
-                key = filename.replace('.md', '')
-                prompt_sets[key] = prompts
-            except Exception as e:
-                print(f"Warning: Could not load prompts from {filename}: {e}")
+        # Load the files concurrently; each goes through the _load_md cache
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+            results = executor.map(self._try_load_prompts_from_markdown, files)
+        
+        for filename, prompts in results:
+            if prompts is None:
+                continue
+            # Remove .md extension for key name
+            key = filename.replace('.md', '')
+            prompt_sets[key] = prompts
         
         return prompt_sets
     
-    def get_prompt_set_info(self) -> Dict[str, Any]:
+    def get_prompt_set_info(self, include_prompts: bool = False) -> Dict[str, Any]:
         """
         Get information about all available prompt sets.
         
+        Args:
+            include_prompts: Also include each set's prompts, not just its count
+            
         Returns:
             Dictionary with prompt set information
         """
@@ -176,10 +233,9 @@ class PromptLoader:
         }
         
         for set_name, prompts in prompt_sets.items():
-            info['sets'][set_name] = {
-                'count': len(prompts),
-                'prompts': prompts
-            }
+            info['sets'][set_name] = {'count': len(prompts)}
+            if include_prompts:
+                info['sets'][set_name]['prompts'] = prompts
         
         return info
 
@@ -237,21 +293,21 @@ if __name__ == "__main__":
     # Test the prompt loader
     loader = PromptLoader()
     
-    print("Available prompt files:")
-    print("=" * 40)
+    # Build the whole report first and write it out in one go
+    lines = ["Available prompt files:", "=" * 40]
     for filename in loader.get_available_prompt_files():
-        print(f"- {filename}")
+        lines.append(f"- {filename}")
     
-    print("\nPrompt set information:")
-    print("=" * 40)
-    info = loader.get_prompt_set_info()
-    print(f"Total sets: {info['total_sets']}")
-    print(f"Total prompts: {info['total_prompts']}")
+    lines += ["\nPrompt set information:", "=" * 40]
+    info = loader.get_prompt_set_info(include_prompts=True)
+    lines.append(f"Total sets: {info['total_sets']}")
+    lines.append(f"Total prompts: {info['total_prompts']}")
     
-    print("\nDetailed breakdown:")
-    print("-" * 40)
+    lines += ["\nDetailed breakdown:", "-" * 40]
     for set_name, set_info in info['sets'].items():
-        print(f"{set_name}: {set_info['count']} prompts")
+        lines.append(f"{set_name}: {set_info['count']} prompts")
         for i, prompt in enumerate(set_info['prompts'], 1):
-            print(f"  {i}. {prompt}")
-        print() 
\ No newline at end of file
+            lines.append(f"  {i}. {prompt}")
+        lines.append("")
+    
+    print("\n".join(lines))
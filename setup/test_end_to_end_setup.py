@@ -25,8 +25,15 @@ class AzureAIBingTest:
     def __init__(self):
         self.agents_client = None
         self.test_agent = None
+        self.credential = None
+        self.env = {}
         self.results = {}
         
+    def _get_credential(self):
+        """Create the DefaultAzureCredential once and reuse it across tests"""
+        self.credential = self.credential or DefaultAzureCredential()
+        return self.credential
+    
     def test_environment_variables(self):
         """Test 1: Environment Variables"""
         logger.info("🧪 Test 1: Environment Variables")
@@ -49,6 +56,9 @@ class AzureAIBingTest:
                 logger.error(f"❌ {description}: Not set")
                 all_good = False
         
+        # Keep the values so later tests don't have to re-read the environment
+        self.env = {var: os.environ[var] for var in required_vars if var in os.environ}
+        
         self.results['environment_variables'] = all_good
         return all_good
     
@@ -57,7 +67,7 @@ class AzureAIBingTest:
         logger.info("🧪 Test 2: Azure Authentication")
         
         try:
-            credential = DefaultAzureCredential()
+            credential = self._get_credential()
             logger.info("✅ DefaultAzureCredential created")
             
             # Test getting a token
@@ -77,14 +87,14 @@ class AzureAIBingTest:
         logger.info("🧪 Test 3: AI Foundry Connectivity")
         
         try:
-            endpoint = os.getenv('AZURE_AI_PROJECTS_CONNECTION_STRING')
+            endpoint = self.env.get('AZURE_AI_PROJECTS_CONNECTION_STRING')
             project_endpoint = f"{endpoint}/api/projects/adnoc"
             
             logger.info(f"🔗 Project endpoint: {project_endpoint}")
             
             self.agents_client = AgentsClient(
                 endpoint=project_endpoint,
-                credential=DefaultAzureCredential()
+                credential=self._get_credential()
             )
             
             logger.info("✅ Agents client created successfully")
@@ -106,7 +116,7 @@ class AzureAIBingTest:
         logger.info("🧪 Test 4: Bing Grounding Tool Creation")
         
         try:
-            connection_id = os.getenv('BING_GROUNDING_CONNECTION_ID')
+            connection_id = self.env.get('BING_GROUNDING_CONNECTION_ID')
             
             if not connection_id:
                 logger.error("❌ BING_GROUNDING_CONNECTION_ID not set")
@@ -130,7 +140,7 @@ class AzureAIBingTest:
         logger.info("🧪 Test 5: Agent Creation with Bing Grounding Tool")
         
         try:
-            connection_id = os.getenv('BING_GROUNDING_CONNECTION_ID')
+            connection_id = self.env.get('BING_GROUNDING_CONNECTION_ID')
             bing_tool = BingGroundingTool(connection_id=connection_id)
             
             # Create agent with Bing Grounding Tool
@@ -183,39 +193,37 @@ class AzureAIBingTest:
             
             logger.info(f"🔍 Testing search with: {test_question}")
             
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             # Create thread and run
-            run = self.agents_client.create_thread_and_process_run(
-                agent_id=self.test_agent.id,
-                thread={
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": test_question
-                        }
-                    ]
-                }
+            thread = self.agents_client.threads.create(
+                messages=[
+                    {
+                        "role": "user",
+                        "content": test_question
+                    }
+                ]
             )
+            run = self.agents_client.runs.create(thread_id=thread.id, agent_id=self.test_agent.id)
             
             logger.info(f"📝 Run created: {run.id}")
             
-            # Wait for completion
+            # Wait for completion, polling quickly at first and backing off to 1s
+            delay = 0.05
             while run.status in ['queued', 'in_progress']:
-                time.sleep(1)
-                run = self.agents_client.get_run(thread_id=run.thread_id, run_id=run.id)
+                time.sleep(delay)
+                delay = min(delay * 1.5, 1.0)
+                run = self.agents_client.runs.get(thread_id=thread.id, run_id=run.id)
             
-            total_time = time.time() - start_time
+            total_time = time.perf_counter() - start_time
             logger.info(f"⏱️  Total time: {total_time:.2f}s")
             
-            # Get response
-            messages = self.agents_client.messages.list(thread_id=run.thread_id)
+            # Get response (only the newest message is needed)
+            messages = self.agents_client.messages.list(thread_id=run.thread_id, order="desc", limit=1)
             
-            assistant_message = None
-            for message in messages:
-                if message.role == "assistant":
-                    assistant_message = message
-                    break
+            assistant_message = next(iter(messages), None)
+            if assistant_message and assistant_message.role != "assistant":
+                assistant_message = None
             
             if assistant_message:
                 # Extract response text
@@ -4,35 +4,134 @@ Single Bing Grounding Experiment - Focused on recording responses and understand
 """
 
 import os
+import io
+import re
 import time
+import hashlib
+import asyncio
+import queue
+import atexit
 import logging
+import logging.handlers
+import threading
 import csv
-import json
+import orjson
 from typing import List, Dict, Any
 from datetime import datetime
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 from azure.ai.agents import AgentsClient
-from azure.ai.agents.models import BingGroundingTool
+from azure.core.pipeline.transport import RequestsTransport
 from azure.identity import DefaultAzureCredential
 
-# Configure detailed logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/bing_grounding_experiment.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure detailed logging. Records go onto a queue and a background listener
+# thread does the file/console writes, so logging doesn't block timed requests.
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('logs/bing_grounding_experiment.log'),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+# The queue handler passes the bare message; the listener's handlers add the timestamp/level
+logging.basicConfig(level=logging.INFO, format='%(message)s',
+                    handlers=[logging.handlers.QueueHandler(_log_queue)])
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+# Flush any queued records on exit
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
+# Token scope used by the Azure AI Agents service
+AGENTS_TOKEN_SCOPE = "https://ai.azure.com/.default"
+
+# Columns written to the latency summary CSV (full responses go to a separate file)
+SUMMARY_COLUMNS = [
+    'question', 'current_response_time', 'new_response_time', 'improvement_seconds',
+    'improvement_percentage', 'response_length', 'search_limitations', 'expected_behavior',
+    'search_number', 'timestamp'
+]
+
+# Keywords that suggest the response didn't come from a live search, scanned in one
+# case-insensitive pass over the response
+_LIMITATION_RE = re.compile(
+    r'(?P<search>search)|(?P<issue>issue|unable)|(?P<training_data>training data)|(?P<cutoff>2023|october)',
+    re.IGNORECASE
+)
+
+def detect_search_limitations(response: str) -> List[str]:
+    """Return human-readable labels for search limitations mentioned in a response"""
+    hits = {match.lastgroup for match in _LIMITATION_RE.finditer(response)}
+    
+    search_limitations = []
+    if 'search' in hits and 'issue' in hits:
+        search_limitations.append("Mentions search issues")
+    if 'training_data' in hits:
+        search_limitations.append("Mentions training data cutoff")
+    if 'cutoff' in hits:
+        search_limitations.append("Mentions 2023/October cutoff")
+    return search_limitations
+
+def _extract_text(message) -> str:
+    """Return the text of an agent message, or '' if it has none"""
+    try:
+        content = message.content
+        if isinstance(content, str):
+            return content
+        return content[0].text.value
+    except (AttributeError, IndexError, TypeError):
+        return ""
+
+# Default cap on repeated searches (-s) of one prompt running in parallel
+MAX_PARALLEL_SEARCHES = 5
+
+# Name of the agent this experiment creates and reuses
+AGENT_NAME = "bing-grounding-experiment-agent"
+
+# Local record of the configured agent, so reruns can skip listing/updating agents
+AGENT_CACHE_FILE = os.path.join('.cache', 'bing_agent.json')
+AGENT_CACHE_TTL = 60  # seconds
+
+# Shared credential so its in-memory token cache is reused by every client
+_CREDENTIAL = None
+_CREDENTIAL_LOCK = threading.Lock()
+
+def get_credential() -> DefaultAzureCredential:
+    """Return the process-wide DefaultAzureCredential, creating it on first use"""
+    global _CREDENTIAL
+    if _CREDENTIAL is None:
+        with _CREDENTIAL_LOCK:
+            if _CREDENTIAL is None:
+                _CREDENTIAL = DefaultAzureCredential()
+    return _CREDENTIAL
+
 class BingGroundingExperiment:
+    # Keep-alive connection pool shared by every experiment's AgentsClient
+    HTTP_POOL_SIZE = 32
+    _transport = None
+
+    @classmethod
+    def get_transport(cls) -> RequestsTransport:
+        """Return the shared HTTP transport, creating its session on first use"""
+        if cls._transport is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=cls.HTTP_POOL_SIZE, pool_maxsize=cls.HTTP_POOL_SIZE)
+            session.mount('https://', adapter)
+            # session_owner=False so closing one client doesn't close the shared session
+            cls._transport = RequestsTransport(session=session, session_owner=False)
+        return cls._transport
+
     def __init__(self, endpoint: str, connection_id: str = None):
         logger.info(f"Initializing Bing Grounding Experiment with endpoint: {endpoint}")
         self.endpoint = endpoint
         self.connection_id = connection_id
+        self.credential = None
         self.agents_client = None
         self.agent = None
         self.initialize_client()
@@ -41,8 +140,8 @@ class BingGroundingExperiment:
         """Initialize the Azure AI Agents client"""
         logger.info("Initializing Azure AI Agents client...")
         try:
-            # Use DefaultAzureCredential for authentication
-            credential = DefaultAzureCredential()
+            # Use the shared DefaultAzureCredential for authentication
+            self.credential = get_credential()
             logger.info("DefaultAzureCredential initialized successfully")
             
             # Create the agents client with the project-specific endpoint
@@ -52,25 +151,38 @@ class BingGroundingExperiment:
             
             self.agents_client = AgentsClient(
                 endpoint=project_endpoint,
-                credential=credential
+                credential=self.credential,
+                transport=self.get_transport()
             )
             logger.info("AgentsClient created successfully")
             
-            # List existing agents first
-            logger.info("Listing existing agents...")
+            # Pre-warm the token cache so the first timed request doesn't pay for auth
+            try:
+                self.credential.get_token(AGENTS_TOKEN_SCOPE)
+                logger.info("Access token cached")
+            except Exception as e:
+                logger.warning(f"Could not pre-fetch access token: {e}")
+            
+            # Reuse the agent configured by a recent run (a single get_agent call)
+            self.agent = self.load_cached_agent()
+            if self.agent:
+                logger.info(f"Using cached agent: {self.agent.id} ({self.agent.name})")
+                logger.info(f"Agent tools count: {len(self.agent.tools) if self.agent.tools else 0}")
+                return
+            
+            # Look for our experiment agent, stopping at the first match so we
+            # don't page through every agent in the project
+            logger.info("Looking for existing experiment agent...")
             try:
-                agents = list(self.agents_client.list_agents())
-                logger.info(f"Found {len(agents)} existing agents:")
-                for agent in agents:
-                    logger.info(f"  - ID: {agent.id}, Name: {agent.name}")
+                self.agent = next(
+                    (agent for agent in self.agents_client.list_agents() if agent.name == AGENT_NAME),
+                    None
+                )
                 
-                # Use the first available agent
-                if agents:
-                    self.agent = agents[0]
+                if self.agent:
                     logger.info(f"Using agent: {self.agent.id} ({self.agent.name})")
                 else:
-                    logger.warning("No existing agents found. Will create a new one.")
-                    self.agent = None
+                    logger.warning(f"No existing '{AGENT_NAME}' agent found. Will create a new one.")
                     
             except Exception as e:
                 logger.warning(f"Could not list agents: {e}")
@@ -82,7 +194,7 @@ class BingGroundingExperiment:
                 try:
                     # Create a new agent with basic configuration
                     self.agent = self.agents_client.create_agent(
-                        name="bing-grounding-experiment-agent",
+                        name=AGENT_NAME,
                         instructions="You are a helpful assistant with access to real-time web search via Bing Grounding Tool.",
                         model="gpt-4o",
                         temperature=0.0
@@ -140,7 +252,7 @@ class BingGroundingExperiment:
                         try:
                             logger.info("🔄 Creating new agent with Bing Grounding Tool...")
                             new_agent = self.agents_client.create_agent(
-                                name="bing-grounding-experiment-agent",
+                                name=AGENT_NAME,
                                 instructions="You are a helpful assistant with access to real-time web search via Bing Grounding Tool.",
                                 model="gpt-4o",
                                 tools=[tool_definition],
@@ -160,11 +272,74 @@ class BingGroundingExperiment:
                 logger.info("⚠️  NOTE: No connection_id provided")
                 logger.info("   The agent will respond using its training data only")
                 logger.info("   To enable web search, we need to add BingGroundingTool with connection_id")
+            
+            # Only remember the agent once it's actually configured as requested
+            if not self.connection_id or self.agent.tools:
+                self.save_agent_cache()
                 
         except Exception as e:
             logger.error(f"Failed to initialize client: {e}")
             raise
 
+    @staticmethod
+    def _tools_hash(tools) -> str:
+        """Stable hash of an agent's tool configuration"""
+        payload = orjson.dumps(
+            [tool.as_dict() if hasattr(tool, 'as_dict') else tool for tool in tools or []],
+            option=orjson.OPT_SORT_KEYS, default=str
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    def load_cached_agent(self):
+        """Return the agent recorded by a recent run if it is still valid, otherwise None"""
+        try:
+            with open(AGENT_CACHE_FILE, 'rb') as f:
+                cache = orjson.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        
+        if not isinstance(cache, dict):
+            return None
+        
+        try:
+            expired = time.time() - cache.get('ts', 0) >= AGENT_CACHE_TTL
+        except TypeError:
+            # Non-numeric timestamp
+            return None
+        
+        if (expired
+                or cache.get('endpoint') != self.endpoint
+                or cache.get('connection_id') != self.connection_id):
+            return None
+        
+        try:
+            agent = self.agents_client.get_agent(cache['agent_id'])
+        except Exception as e:
+            # e.g. the agent was deleted; fall back to the full lookup
+            logger.info(f"Cached agent unavailable ({e}), looking up agents again")
+            return None
+        
+        if self._tools_hash(agent.tools) != cache.get('tools_hash'):
+            logger.info("Cached agent tools have changed, reconfiguring agent")
+            return None
+        
+        return agent
+
+    def save_agent_cache(self):
+        """Record the configured agent so runs within AGENT_CACHE_TTL can reuse it"""
+        try:
+            os.makedirs(os.path.dirname(AGENT_CACHE_FILE), exist_ok=True)
+            with open(AGENT_CACHE_FILE, 'wb') as f:
+                f.write(orjson.dumps({
+                    'endpoint': self.endpoint,
+                    'connection_id': self.connection_id,
+                    'agent_id': self.agent.id,
+                    'tools_hash': self._tools_hash(self.agent.tools),
+                    'ts': time.time()
+                }))
+        except OSError as e:
+            logger.warning(f"Could not write agent cache: {e}")
+
     def load_test_prompts(self, prompt_file: str = None) -> List[Dict[str, Any]]:
         """Load test prompts from specified file or default to CSV"""
         if prompt_file:
@@ -183,6 +358,7 @@ class BingGroundingExperiment:
                 prompts.append({
                     'question': content,
                     'current_response_time': '30.0s',  # Estimated baseline for long prompt
+                    'current_response_time_sec': 30.0,
                     'expected_behavior': 'Should provide comprehensive real-time search results with citations'
                 })
                 
@@ -194,22 +370,27 @@ class BingGroundingExperiment:
         else:
             # Load from CSV file
             try:
-                import pandas as pd
                 csv_file = prompt_file if prompt_file else 'prompts/bing-prompts.csv'
-                df = pd.read_csv(csv_file)
-                logger.info(f"Found {len(df)} prompts in CSV file")
-                
-                for _, row in df.iterrows():
-                    # Clean up the response time (remove 's' suffix if present)
-                    current_time = str(row['Current response time (seconds)'])
-                    if current_time.endswith('s'):
-                        current_time = current_time[:-1]
-                    
-                    prompts.append({
-                        'question': row['Question'],
-                        'current_response_time': f"{current_time}s",
-                        'expected_behavior': 'Should provide real-time search results with citations'
-                    })
+                with open(csv_file, newline='', encoding='utf-8-sig') as fp:
+                    for row in csv.DictReader(fp):
+                        # Clean up the response time (remove 's' suffix if present)
+                        current_time = (row['Current response time (seconds)'] or '').strip()
+                        if current_time.endswith('s'):
+                            current_time = current_time[:-1]
+                        
+                        # A bad cell only loses the improvement columns, not the run
+                        try:
+                            current_time_sec = float(current_time)
+                        except ValueError:
+                            logger.warning(f"Unparseable response time {current_time!r} for: {row['Question'][:50]}...")
+                            current_time_sec = None
+                        
+                        prompts.append({
+                            'question': row['Question'],
+                            'current_response_time': f"{current_time}s",
+                            'current_response_time_sec': current_time_sec,
+                            'expected_behavior': 'Should provide real-time search results with citations'
+                        })
                 
                 logger.info(f"Loaded {len(prompts)} prompts from CSV")
                 
@@ -223,138 +404,222 @@ class BingGroundingExperiment:
         logger.info(f"Total prompts loaded: {len(prompts)}")
         return prompts
 
-    def test_prompt_latency(self, prompt_data: Dict[str, Any], search_count: int = 1):
+    def wait_for_run(self, run, initial_delay: float = 0.2, max_delay: float = 2.0):
+        """Poll a run until it finishes, doubling the delay between polls up to max_delay"""
+        delay = initial_delay
+        while run.status in ("queued", "in_progress", "cancelling"):
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+            run = self.agents_client.runs.get(thread_id=run.thread_id, run_id=run.id)
+        return run
+
+    def test_prompt_latency(self, prompt_data: Dict[str, Any], search_count: int = 1,
+                            max_parallel_searches: int = MAX_PARALLEL_SEARCHES, reuse_thread: bool = False):
         """Test latency for a single prompt and record the full response"""
         question = prompt_data['question']
-        current_time = prompt_data['current_response_time']
-        expected_behavior = prompt_data['expected_behavior']
         
         logger.info(f"Testing prompt: {question[:100]}...")
-        logger.info(f"Current response time: {current_time}")
-        logger.info(f"Expected behavior: {expected_behavior}")
+        logger.info(f"Current response time: {prompt_data['current_response_time']}")
+        logger.info(f"Expected behavior: {prompt_data['expected_behavior']}")
         logger.info(f"Running {search_count} searches")
         
-        results = []
+        # One second-resolution timestamp for all of this prompt's searches
+        timestamp = datetime.now().isoformat(timespec='seconds')
+        
+        # Every search starts a fresh thread by default so all samples have the
+        # same setup: a reused thread carries earlier answers as extra context and
+        # the model may answer follow-ups without searching. reuse_thread opts into
+        # follow-up runs, which then go one at a time on a single thread
+        if reuse_thread:
+            return self._run_sequential_searches(prompt_data, search_count, timestamp)
         
+        workers = max(1, min(search_count, max_parallel_searches))
+        if workers == 1:
+            return [self._single_run(prompt_data, i, search_count, timestamp)[0] for i in range(search_count)]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._single_run, prompt_data, i, search_count, timestamp)
+                for i in range(search_count)
+            ]
+            return [future.result()[0] for future in futures]
+
+    def _run_sequential_searches(self, prompt_data: Dict[str, Any], search_count: int,
+                                 timestamp: str) -> List[Dict[str, Any]]:
+        """Run a prompt's searches one after another, reusing a thread between them"""
+        results = []
+        thread_id = None
         for i in range(search_count):
-            logger.info(f"Starting search {i+1}/{search_count}")
+            result, thread_id = self._single_run(prompt_data, i, search_count, timestamp, thread_id)
+            results.append(result)
+        return results
+
+    def _single_run(self, prompt_data: Dict[str, Any], i: int, search_count: int, timestamp: str,
+                    thread_id: str = None):
+        """
+        Run one search for a prompt.
+        
+        Returns the result record and the thread id to reuse for the next search
+        (None if the next search should start a fresh thread).
+        """
+        question = prompt_data['question']
+        current_time = prompt_data['current_response_time']
+        # Numeric baseline parsed once at load time (display string is kept for the CSV)
+        baseline = prompt_data.get('current_response_time_sec')
+        expected_behavior = prompt_data['expected_behavior']
+        
+        logger.info(f"Starting search {i+1}/{search_count}")
+        
+        try:
+            # Create the thread and run separately and poll ourselves, so the
+            # measured time isn't padded by the SDK's fixed polling interval
+            start_time_total = time.perf_counter()
+            logger.info("Creating thread and starting run...")
             
-            try:
-                # Use the create_thread_and_process_run method
-                start_time_total = time.time()
-                logger.info("Creating thread and processing run...")
-                
-                # Create thread and run in one call
-                logger.info(f"🔍 Creating thread and run with agent: {self.agent.id}")
-                logger.info(f"🔧 Agent tools: {len(self.agent.tools) if self.agent.tools else 0}")
-                
-                run = self.agents_client.create_thread_and_process_run(
+            logger.info(f"🔍 Creating thread and run with agent: {self.agent.id}")
+            logger.info(f"🔧 Agent tools: {len(self.agent.tools) if self.agent.tools else 0}")
+            
+            user_message = {
+                "role": "user",
+                "content": question
+            }
+            if thread_id is None:
+                thread = self.agents_client.threads.create(messages=[user_message])
+                thread_id = thread.id
+                run = self.agents_client.runs.create(thread_id=thread_id, agent_id=self.agent.id)
+            else:
+                # Repeat searches reuse the thread, adding the question with the run itself
+                run = self.agents_client.runs.create(
+                    thread_id=thread_id,
                     agent_id=self.agent.id,
-                    thread={
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": question
-                            }
-                        ]
-                    }
+                    additional_messages=[user_message]
                 )
+            logger.info(f"📝 Run created: {run.id} (thread: {thread_id})")
+            
+            run = self.wait_for_run(run)
+            logger.info(f"📊 Run status: {run.status}")
+            if run.status != "completed":
+                # A failed/cancelled/expired run is an error, not a latency sample
+                raise RuntimeError(f"Run ended with status {run.status}: {run.last_error}")
+            
+            total_time = time.perf_counter() - start_time_total
+            logger.info(f"Search {i+1}/{search_count} completed in {total_time:.2f}s")
+            
+            search_limitations = []
+            
+            # Get the response
+            logger.info("Getting response messages...")
+            try:
+                # Only the newest message is needed: the assistant's reply to this run
+                messages = self.agents_client.messages.list(thread_id=run.thread_id, order="desc", limit=1)
                 
-                logger.info(f"📝 Run created: {run.id}")
-                logger.info(f"📊 Run status: {run.status}")
-                
-                total_time = time.time() - start_time_total
-                logger.info(f"Search {i+1}/{search_count} completed in {total_time:.2f}s")
+                message = next(iter(messages), None)
+                assistant_message = message if message and message.role == "assistant" else None
+                full_response = _extract_text(assistant_message) if assistant_message else ""
                 
-                # Get the response
-                logger.info("Getting response messages...")
-                try:
-                    # Use the messages attribute which should have a list method
-                    messages = self.agents_client.messages.list(thread_id=run.thread_id)
-                    
-                    # Find the assistant's response
-                    assistant_message = None
-                    full_response = ""
-                    
-                    for message in messages:
-                        if message.role == "assistant":
-                            assistant_message = message
-                            # Extract the actual response text
-                            if hasattr(message, 'content') and message.content:
-                                if isinstance(message.content, list):
-                                    for content_item in message.content:
-                                        if hasattr(content_item, 'text') and hasattr(content_item.text, 'value'):
-                                            full_response = content_item.text.value
-                                            break
-                                elif isinstance(message.content, str):
-                                    full_response = message.content
-                            break
+                if assistant_message and full_response:
+                    logger.info(f"✅ Response received: {len(full_response)} characters")
+                    logger.info(f"📝 Full response: {full_response}")
                     
-                    if assistant_message and full_response:
-                        logger.info(f"✅ Response received: {len(full_response)} characters")
-                        logger.info(f"📝 Full response: {full_response}")
+                    # Check if response mentions search limitations
+                    search_limitations = detect_search_limitations(full_response)
                         
-                        # Check if response mentions search limitations
-                        search_limitations = []
-                        if "search" in full_response.lower() and ("issue" in full_response.lower() or "unable" in full_response.lower()):
-                            search_limitations.append("Mentions search issues")
-                        if "training data" in full_response.lower():
-                            search_limitations.append("Mentions training data cutoff")
-                        if "2023" in full_response.lower() or "october" in full_response.lower():
-                            search_limitations.append("Mentions 2023/October cutoff")
-                            
-                        logger.info(f"🔍 Search limitations detected: {search_limitations}")
-                        
-                    else:
-                        logger.warning("No assistant response found")
-                        full_response = "No response received"
-                        
-                except Exception as e:
-                    logger.error(f"Error getting messages: {e}")
-                    full_response = f"Error: {str(e)}"
-                
-                results.append({
-                    'question': question,
-                    'current_response_time': current_time,
-                    'new_response_time': total_time,
-                    'improvement_seconds': float(current_time.replace('s', '')) - total_time if 's' in current_time else None,
-                    'improvement_percentage': ((float(current_time.replace('s', '')) - total_time) / float(current_time.replace('s', '')) * 100) if 's' in current_time else None,
-                    'response_length': len(full_response),
-                    'full_response': full_response,
-                    'search_limitations': search_limitations if 'search_limitations' in locals() else [],
-                    'expected_behavior': expected_behavior,
-                    'search_number': i + 1,
-                    'timestamp': datetime.now().isoformat()
-                })
-                
-                # Add delay between searches
-                if i < search_count - 1:
-                    delay = 2  # 2 second delay between searches
-                    logger.info(f"Waiting {delay}s before next search...")
-                    time.sleep(delay)
+                    logger.info(f"🔍 Search limitations detected: {search_limitations}")
+                    
+                else:
+                    logger.warning("No assistant response found")
+                    full_response = "No response received"
                     
             except Exception as e:
-                logger.error(f"Error during search {i+1}: {e}")
-                results.append({
-                    'question': question,
-                    'current_response_time': current_time,
-                    'new_response_time': None,
-                    'improvement_seconds': None,
-                    'improvement_percentage': None,
-                    'response_length': 0,
-                    'full_response': f"Error: {str(e)}",
-                    'search_limitations': [],
-                    'expected_behavior': expected_behavior,
-                    'search_number': i + 1,
-                    'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                })
+                logger.error(f"Error getting messages: {e}")
+                full_response = f"Error: {str(e)}"
+            
+            return {
+                'question': question,
+                'current_response_time': current_time,
+                'new_response_time': total_time,
+                'improvement_seconds': baseline - total_time if baseline else None,
+                'improvement_percentage': ((baseline - total_time) / baseline * 100) if baseline else None,
+                'response_length': len(full_response),
+                'full_response': full_response,
+                'search_limitations': search_limitations,
+                'expected_behavior': expected_behavior,
+                'search_number': i + 1,
+                'timestamp': timestamp
+            }, thread_id
+            
+        except Exception as e:
+            logger.error(f"Error during search {i+1}: {e}")
+            return {
+                'question': question,
+                'current_response_time': current_time,
+                'new_response_time': None,
+                'improvement_seconds': None,
+                'improvement_percentage': None,
+                'response_length': 0,
+                'full_response': f"Error: {str(e)}",
+                'search_limitations': [],
+                'expected_behavior': expected_behavior,
+                'search_number': i + 1,
+                'error': str(e),
+                'timestamp': timestamp
+            }, None
+
+    async def atest_prompt_latency(self, prompt_data: Dict[str, Any], search_count: int,
+                                   executor: ThreadPoolExecutor, semaphore: asyncio.Semaphore,
+                                   label: str = "", max_parallel_searches: int = MAX_PARALLEL_SEARCHES,
+                                   reuse_thread: bool = False):
+        """Run test_prompt_latency on the executor, bounded by the semaphore"""
+        async with semaphore:
+            logger.info(f"Processing prompt {label}")
+            loop = asyncio.get_running_loop()
+            # The SDK calls are blocking network I/O, so run them off the event loop
+            return await loop.run_in_executor(executor, self.test_prompt_latency, prompt_data, search_count,
+                                              max_parallel_searches, reuse_thread)
+
+    async def run_prompts_concurrently(self, prompts: List[Dict[str, Any]], search_count: int = 1,
+                                       max_concurrency: int = 1, on_results=None,
+                                       max_parallel_searches: int = MAX_PARALLEL_SEARCHES,
+                                       reuse_thread: bool = False) -> None:
+        """
+        Test all prompts with at most max_concurrency in flight.
         
-        return results
+        Each prompt's results are passed to on_results as soon as that prompt
+        finishes (so in completion order, not prompt order).
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            tasks = [
+                asyncio.create_task(self.atest_prompt_latency(
+                    prompt_data, search_count, executor, semaphore, label=f"{i+1}/{len(prompts)}",
+                    max_parallel_searches=max_parallel_searches, reuse_thread=reuse_thread))
+                for i, prompt_data in enumerate(prompts)
+            ]
+            for task in asyncio.as_completed(tasks):
+                results = await task
+                if on_results:
+                    on_results(results)
+
+    @staticmethod
+    def format_response_record(number: int, result: Dict[str, Any]) -> str:
+        """Format one result for the full-responses file"""
+        response_time = result['new_response_time']
+        buf = io.StringIO()
+        buf.write(f"PROMPT {number}:\n")
+        buf.write(f"Question: {result['question']}\n")
+        buf.write(f"Response Time: {f'{response_time:.2f}s' if response_time is not None else 'N/A'}\n")
+        buf.write(f"Search Limitations: {result.get('search_limitations', [])}\n")
+        buf.write(f"Response Length: {result['response_length']} characters\n")
+        buf.write("-" * 30 + "\n")
+        buf.write(f"FULL RESPONSE:\n{result['full_response']}\n")
+        buf.write("\n" + "=" * 50 + "\n\n")
+        return buf.getvalue()
 
-    def run_experiment(self, prompt_file: str = None, search_count: int = 1):
+    def run_experiment(self, prompt_file: str = None, search_count: int = 1, max_concurrency: int = 1,
+                       max_parallel_searches: int = MAX_PARALLEL_SEARCHES, reuse_thread: bool = False):
         """Run the complete experiment"""
-        logger.info(f"Starting Bing Grounding Experiment with {search_count} searches per prompt")
+        logger.info(f"Starting Bing Grounding Experiment with {search_count} searches per prompt "
+                    f"(concurrency: {max_concurrency})")
         
         # Load test prompts
         prompts = self.load_test_prompts(prompt_file)
@@ -362,73 +627,70 @@ class BingGroundingExperiment:
             logger.error("No prompts loaded")
             return
         
-        all_results = []
-        
-        for i, prompt_data in enumerate(prompts):
-            logger.info(f"Processing prompt {i+1}/{len(prompts)}")
-            results = self.test_prompt_latency(prompt_data, search_count)
-            all_results.extend(results)
-            
-            # Add delay between prompts
-            if i < len(prompts) - 1:
-                delay = 3  # 3 second delay between prompts
-                logger.info(f"Waiting {delay}s before next prompt...")
-                time.sleep(delay)
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(all_results)
-        
-        # Save latency summary to CSV (without full responses)
+        # Results are streamed to the latency summary CSV and the full responses file
+        # as each prompt completes; only the summary rows are kept in memory
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        summary_df = df[['question', 'current_response_time', 'new_response_time', 'improvement_seconds', 'improvement_percentage', 'response_length', 'search_limitations', 'expected_behavior', 'search_number', 'timestamp']].copy()
         filename = f"logs/bing_grounding_results_{timestamp}.csv"
-        summary_df.to_csv(filename, index=False)
-        logger.info(f"Latency summary saved to {filename}")
-        
-        # Save full responses to a separate file for easy reading
         responses_filename = f"logs/bing_grounding_responses_{timestamp}.txt"
-        with open(responses_filename, 'w', encoding='utf-8') as f:
-            f.write("BING GROUNDING EXPERIMENT - FULL RESPONSES\n")
-            f.write("=" * 50 + "\n\n")
+        summary_rows = []
+        
+        with open(filename, 'w', newline='', encoding='utf-8') as summary_fp, \
+                open(responses_filename, 'w', encoding='utf-8', buffering=1 << 20) as responses_fp:
+            summary_csv = csv.DictWriter(summary_fp, fieldnames=SUMMARY_COLUMNS, extrasaction='ignore')
+            summary_csv.writeheader()
+            responses_fp.write("BING GROUNDING EXPERIMENT - FULL RESPONSES\n" + "=" * 50 + "\n\n")
             
-            for i, result in enumerate(all_results):
-                f.write(f"PROMPT {i+1}:\n")
-                f.write(f"Question: {result['question']}\n")
-                f.write(f"Response Time: {result['new_response_time']:.2f}s\n")
-                f.write(f"Search Limitations: {result.get('search_limitations', [])}\n")
-                f.write(f"Response Length: {result['response_length']} characters\n")
-                f.write("-" * 30 + "\n")
-                f.write(f"FULL RESPONSE:\n{result['full_response']}\n")
-                f.write("\n" + "=" * 50 + "\n\n")
+            def record_results(results: List[Dict[str, Any]]):
+                for result in results:
+                    # Store limitations as a compact JSON array rather than a Python list repr
+                    summary_csv.writerow({
+                        **result,
+                        'search_limitations': orjson.dumps(result.get('search_limitations', [])).decode()
+                    })
+                    responses_fp.write(self.format_response_record(len(summary_rows) + 1, result))
+                    summary_rows.append({column: result.get(column) for column in SUMMARY_COLUMNS})
+            
+            # The semaphore bounds in-flight prompts, replacing the fixed delay between them
+            asyncio.run(self.run_prompts_concurrently(prompts, search_count, max_concurrency,
+                                                      on_results=record_results,
+                                                      max_parallel_searches=max_parallel_searches,
+                                                      reuse_thread=reuse_thread))
         
+        logger.info(f"Latency summary saved to {filename}")
         logger.info(f"Full responses saved to {responses_filename}")
         
+        # Imported here so constructing the experiment doesn't pay for pandas/numpy
+        import numpy as np
+        import pandas as pd
+        
+        df = pd.DataFrame(summary_rows, columns=SUMMARY_COLUMNS)
+        
+        # Pull the timing columns out once as float arrays (None -> NaN)
+        times = df['new_response_time'].to_numpy(dtype=float)
+        succeeded = times[~np.isnan(times)]
+        
         # Print summary
         logger.info("Experiment completed!")
-        logger.info(f"Total searches: {len(df)}")
-        logger.info(f"Successful searches: {len(df[df['new_response_time'].notna()])}")
-        logger.info(f"Failed searches: {len(df[df['new_response_time'].isna()])}")
-        
-        if len(df[df['new_response_time'].notna()]) > 0:
-            avg_time = df[df['new_response_time'].notna()]['new_response_time'].mean()
-            min_time = df[df['new_response_time'].notna()]['new_response_time'].min()
-            max_time = df[df['new_response_time'].notna()]['new_response_time'].max()
-            
-            logger.info(f"Average response time: {avg_time:.2f}s")
-            logger.info(f"Min response time: {min_time:.2f}s")
-            logger.info(f"Max response time: {max_time:.2f}s")
+        logger.info(f"Total searches: {len(times)}")
+        logger.info(f"Successful searches: {len(succeeded)}")
+        logger.info(f"Failed searches: {len(times) - len(succeeded)}")
+        
+        if len(succeeded) > 0:
+            logger.info(f"Average response time: {succeeded.mean():.2f}s")
+            logger.info(f"Min response time: {succeeded.min():.2f}s")
+            logger.info(f"Max response time: {succeeded.max():.2f}s")
             
             # Calculate improvements
-            improvements = df[df['improvement_seconds'].notna()]
-            if len(improvements) > 0:
-                avg_improvement = improvements['improvement_seconds'].mean()
-                avg_improvement_pct = improvements['improvement_percentage'].mean()
+            improvement_seconds = df['improvement_seconds'].to_numpy(dtype=float)
+            if not np.isnan(improvement_seconds).all():
+                avg_improvement = np.nanmean(improvement_seconds)
+                avg_improvement_pct = np.nanmean(df['improvement_percentage'].to_numpy(dtype=float))
                 logger.info(f"Average improvement: {avg_improvement:.2f}s ({avg_improvement_pct:.1f}%)")
         
         # Summary of search limitations
         all_limitations = []
-        for result in all_results:
-            all_limitations.extend(result.get('search_limitations', []))
+        for row in summary_rows:
+            all_limitations.extend(row['search_limitations'] or [])
         
         logger.info(f"Search limitations found: {set(all_limitations)}")
         
@@ -437,11 +699,25 @@ class BingGroundingExperiment:
 def main():
     import argparse
     
+    def positive_int(value):
+        """argparse type for options that must be at least 1"""
+        number = int(value)
+        if number < 1:
+            raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+        return number
+    
     parser = argparse.ArgumentParser(description='Bing Grounding Experiment')
     parser.add_argument('--prompt-file', '-p', 
                        help='Path to prompt file (CSV or MD). Default: prompts/bing-prompts.csv')
     parser.add_argument('--search-count', '-s', type=int, default=1,
                        help='Number of searches per prompt (default: 1)')
+    parser.add_argument('--concurrency', '-c', type=positive_int, default=1,
+                       help='Number of prompts to test concurrently (default: 1)')
+    parser.add_argument('--search-concurrency', type=positive_int, default=MAX_PARALLEL_SEARCHES,
+                       help=f'Max searches of the same prompt to run in parallel (default: {MAX_PARALLEL_SEARCHES})')
+    parser.add_argument('--reuse-thread', action='store_true',
+                       help='Run a prompt\'s searches in turn on one thread instead of a fresh thread each; '
+                            'later searches then have the earlier answers in context')
     
     args = parser.parse_args()
     
@@ -465,7 +741,10 @@ def main():
     
     # Create and run experiment
     experiment = BingGroundingExperiment(endpoint, connection_id)
-    experiment.run_experiment(prompt_file=args.prompt_file, search_count=args.search_count)
+    experiment.run_experiment(prompt_file=args.prompt_file, search_count=args.search_count,
+                              max_concurrency=args.concurrency,
+                              max_parallel_searches=args.search_concurrency,
+                              reuse_thread=args.reuse_thread)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file